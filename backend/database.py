@@ -1,4 +1,7 @@
+import asyncio
+import queue
 import sqlite3
+import threading
 import json
 import os
 from pathlib import Path
@@ -8,11 +11,33 @@ from contextlib import contextmanager
 # Database file path
 DB_PATH = Path("interview.db")
 
+# WAL mode is persistent in the database file, so it only needs to be set once
+# per process (the first connection flips it; later ones just confirm it).
+_wal_enabled = False
+
 def get_db_connection():
     """Get a SQLite database connection."""
+    global _wal_enabled
     # Increased timeout to prevent "database is locked" errors during concurrent writes.
-    conn = sqlite3.connect(DB_PATH, timeout=15)
+    # check_same_thread=False lets pooled connections move between executor
+    # threads; each connection is only ever used by one thread at a time.
+    # cached_statements keeps more prepared statements hot in the driver's
+    # per-connection LRU (default is 128).
+    conn = sqlite3.connect(DB_PATH, timeout=30, check_same_thread=False,
+                           cached_statements=256)
     conn.row_factory = sqlite3.Row  # Enable column access by name
+
+    if not _wal_enabled:
+        # WAL lets readers proceed concurrently with a writer instead of blocking.
+        conn.execute("PRAGMA journal_mode=WAL")
+        _wal_enabled = True
+
+    # Per-connection tuning (these do not persist in the database file)
+    conn.execute("PRAGMA synchronous=NORMAL")    # Safe with WAL; skips an fsync per commit
+    conn.execute("PRAGMA busy_timeout=30000")    # Wait for locks inside SQLite instead of failing
+    conn.execute("PRAGMA temp_store=MEMORY")
+    conn.execute("PRAGMA cache_size=-20000")     # ~20MB page cache
+
     return conn
 
 @contextmanager
@@ -28,9 +53,78 @@ def get_db():
     finally:
         conn.close()
 
+# --- Connection pooling ---
+# Opening a connection replays the per-connection PRAGMAs each time, which is
+# wasted work on hot paths. SQLite only supports one writer at a time anyway,
+# so keep a single persistent writer connection plus a small pool of reader
+# connections that scale concurrently under WAL.
+
+_POOL_SIZE = 4
+_reader_pool: queue.Queue = queue.Queue()
+_writer_conn: Optional[sqlite3.Connection] = None
+_writer_conn_lock = threading.Lock()
+
+@contextmanager
+def get_writer():
+    """Context manager for the shared persistent writer connection."""
+    global _writer_conn
+    # The threading lock keeps the single writer safe even for writes that
+    # happen outside the async write_lock (e.g. on executor threads).
+    with _writer_conn_lock:
+        if _writer_conn is None:
+            _writer_conn = get_db_connection()
+        try:
+            yield _writer_conn
+            _writer_conn.commit()
+        except Exception:
+            _writer_conn.rollback()
+            raise
+
+@contextmanager
+def get_reader():
+    """Context manager that borrows a reader connection from the pool."""
+    try:
+        conn = _reader_pool.get_nowait()
+    except queue.Empty:
+        conn = get_db_connection()
+    try:
+        yield conn
+        conn.commit()
+    except Exception:
+        conn.rollback()
+        raise
+    finally:
+        if _reader_pool.qsize() < _POOL_SIZE:
+            _reader_pool.put(conn)
+        else:
+            conn.close()
+
+# SQLite allows only one writer at a time; queue writers here so concurrent
+# requests wait in order instead of busy-polling the database lock.
+write_lock = asyncio.Lock()
+
+async def run_read(func, *args):
+    """Run a blocking DB read helper on the default executor.
+
+    sqlite3 calls block the thread they run on; routing them through a worker
+    thread keeps the event loop free for other requests.
+    """
+    loop = asyncio.get_running_loop()
+    return await loop.run_in_executor(None, func, *args)
+
+async def run_write(func, *args):
+    """Run a blocking DB write helper on the default executor.
+
+    Holds write_lock for the duration so writers stay serialized even though
+    the actual work happens on a worker thread.
+    """
+    async with write_lock:
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(None, func, *args)
+
 def init_database():
     """Initialize the database with required tables."""
-    with get_db() as conn:
+    with get_writer() as conn:
         cursor = conn.cursor()
         
         # Create interview_sessions table
@@ -63,11 +157,37 @@ def init_database():
             )
         """)
         
+        # Create reference_cache table (persistent cache of LLM-generated
+        # reference answers, keyed by a hash of question + JD + resume)
+        cursor.execute("""
+            CREATE TABLE IF NOT EXISTS reference_cache (
+                qhash TEXT PRIMARY KEY,
+                answer TEXT NOT NULL,
+                created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+            )
+        """)
+
         # Create indexes
         cursor.execute("""
-            CREATE INDEX IF NOT EXISTS idx_answers_session_id 
+            CREATE INDEX IF NOT EXISTS idx_answers_session_id
             ON interview_answers(session_id)
         """)
+
+        # One answer per (session, question); also makes the upload_answer
+        # lookup a single B-tree descent and enables the upsert. Databases
+        # created before this index may hold duplicates, so keep only the
+        # newest row per pair before building it.
+        cursor.execute("""
+            DELETE FROM interview_answers
+            WHERE rowid NOT IN (
+                SELECT MAX(rowid) FROM interview_answers
+                GROUP BY session_id, question_id
+            )
+        """)
+        cursor.execute("""
+            CREATE UNIQUE INDEX IF NOT EXISTS idx_answers_session_question
+            ON interview_answers(session_id, question_id)
+        """)
         
         cursor.execute("""
             CREATE INDEX IF NOT EXISTS idx_sessions_status 
@@ -75,6 +195,3 @@ def init_database():
         """)
         
         conn.commit()
-
-# Initialize database on import
-init_database()
@@ -10,10 +10,18 @@ if str(project_root) not in sys.path:
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
 from fastapi.staticfiles import StaticFiles
+from backend.database import init_database
 from backend.routes import session, upload, analyze
 
 app = FastAPI(title="AI Interviewer API")
 
+@app.on_event("startup")
+def run_migrations():
+    # Run schema setup once at startup rather than on import, so hot reloads
+    # and multiple workers don't each replay the CREATE statements at import
+    # time; concurrent workers serialize on SQLite's busy_timeout.
+    init_database()
+
 app.add_middleware(
     CORSMiddleware,
     allow_origins=["*"],
@@ -1,14 +1,148 @@
 from fastapi import APIRouter, HTTPException
 from fastapi.responses import StreamingResponse
-from backend.database import get_db
-
-from backend.services.llm_service import evaluate_answer, generate_reference_answer
-from backend.services.export_service import generate_pdf_report
-import json
-import time
+from backend.database import get_reader, get_writer, run_read, run_write
+
+from backend.services.llm_service import (
+    evaluate_answer,
+    generate_reference_answer,
+    generate_reference_answers_batch,
+)
+from backend.services.export_service import generate_pdf_report, iter_pdf_chunks
+import asyncio
+import functools
+import hashlib
+import orjson
 
 router = APIRouter()
 
+# Module-level SQL constants so statement-cache lookups key on small interned
+# strings instead of re-hashing triple-quoted literals per call.
+# Project only the columns each path consumes; resume_text alone can be many
+# KB, so SELECT * moves a lot of bytes the report path never reads.
+_SQL_SELECT_SESSION_FOR_ANALYSIS = (
+    "SELECT id, job_description, resume_text, questions, status "
+    "FROM interview_sessions WHERE id = ?"
+)
+_SQL_SELECT_ANSWERS_FOR_ANALYSIS = (
+    "SELECT id, question_id, transcript, score "
+    "FROM interview_answers WHERE session_id = ?"
+)
+_SQL_SELECT_SESSION_FOR_REPORT = (
+    "SELECT id, job_description, duration_seconds, questions "
+    "FROM interview_sessions WHERE id = ?"
+)
+_SQL_SELECT_ANSWERS_FOR_REPORT = (
+    "SELECT id, question_id, transcript, score, feedback, model_answer "
+    "FROM interview_answers WHERE session_id = ?"
+)
+_SQL_SELECT_REFERENCE = "SELECT answer FROM reference_cache WHERE qhash = ?"
+_SQL_INSERT_REFERENCE = "INSERT OR REPLACE INTO reference_cache (qhash, answer) VALUES (?, ?)"
+_SQL_UPDATE_ANSWER = "UPDATE interview_answers SET score = ?, feedback = ?, model_answer = ? WHERE id = ?"
+_SQL_UPDATE_SESSION_STATUS = "UPDATE interview_sessions SET status = 'analyzed' WHERE id = ?"
+
+
+def _reference_hash(question: str, jd: str, resume: str) -> str:
+    """Stable cache key for a reference answer request."""
+    payload = f"{question}|{jd}|{resume}".encode()
+    return hashlib.blake2b(payload, digest_size=16).hexdigest()
+
+
+@functools.lru_cache(maxsize=2048)
+def _cached_reference(qhash: str, question: str, jd: str, resume: str) -> str:
+    """
+    Reference-answer lookup with two cache layers: an in-process LRU and the
+    reference_cache SQLite table (so restarts keep their hits). Only falls
+    through to the LLM on a miss in both.
+    """
+    with get_reader() as conn:
+        cursor = conn.cursor()
+        cursor.execute(_SQL_SELECT_REFERENCE, (qhash,))
+        row = cursor.fetchone()
+        if row:
+            return row["answer"]
+
+    answer = generate_reference_answer(question=question, jd=jd, resume=resume)
+
+    with get_writer() as conn:
+        conn.execute(_SQL_INSERT_REFERENCE, (qhash, answer))
+
+    return answer
+
+
+def _resolve_references(qid_to_question: dict, jd: str, resume: str):
+    """Resolve reference answers for a set of questions with one LLM call.
+
+    Hits come from the persistent reference_cache table; all misses are sent
+    to the LLM in a single batched request and persisted. Returns
+    (resolved {qid: answer}, missing [qid]) where missing holds questions the
+    batch didn't cover, for per-question fallback.
+    """
+    resolved = {}
+    misses = {}
+
+    if not qid_to_question:
+        return resolved, []
+
+    with get_reader() as conn:
+        cursor = conn.cursor()
+        for qid, question in qid_to_question.items():
+            cursor.execute(_SQL_SELECT_REFERENCE, (_reference_hash(question, jd, resume),))
+            row = cursor.fetchone()
+            if row:
+                resolved[qid] = row["answer"]
+            else:
+                misses[qid] = question
+
+    if misses:
+        try:
+            batch = generate_reference_answers_batch(misses, jd=jd, resume=resume)
+        except Exception as batch_err:
+            print(f"Batched reference generation failed, falling back per question: {batch_err}")
+            batch = {}
+
+        if batch:
+            with get_writer() as conn:
+                conn.executemany(_SQL_INSERT_REFERENCE, [
+                    (_reference_hash(misses[qid], jd, resume), answer)
+                    for qid, answer in batch.items()
+                ])
+            resolved.update(batch)
+
+    return resolved, [qid for qid in misses if qid not in resolved]
+
+
+def _load_analysis_inputs(session_id: str):
+    """Blocking read of the session row and its answers (runs on a worker thread)."""
+    with get_reader() as conn:
+        cursor = conn.cursor()
+
+        cursor.execute(_SQL_SELECT_SESSION_FOR_ANALYSIS, (session_id,))
+        session_row = cursor.fetchone()
+
+        if not session_row:
+            raise HTTPException(status_code=404, detail="Session not found")
+
+        session = dict(session_row)
+
+        # Parse questions JSON if needed (stored as raw orjson bytes; older rows are TEXT)
+        if isinstance(session.get("questions"), (str, bytes)) and session["questions"]:
+            session["questions"] = orjson.loads(session["questions"])
+
+        cursor.execute(_SQL_SELECT_ANSWERS_FOR_ANALYSIS, (session_id,))
+        answers = [dict(row) for row in cursor.fetchall()]
+
+    return session, answers
+
+
+def _persist_analysis(session_id: str, answer_updates: list):
+    """Blocking write of the batched answer updates plus the status flip."""
+    with get_writer() as conn:
+        cursor = conn.cursor()
+
+        if answer_updates:
+            cursor.executemany(_SQL_UPDATE_ANSWER, answer_updates)
+
+        cursor.execute(_SQL_UPDATE_SESSION_STATUS, (session_id,))
 
 
 @router.post("/analyze/{session_id}")
@@ -19,199 +153,194 @@ async def analyze_session(session_id: str):
     2) Evaluates the candidate transcript against the reference using evaluate_answer(...).
     Persists: score, feedback (JSON), model_answer (reference).
     """
-    max_db_retries = 3
-    retry_count = 0
-    
-    while retry_count < max_db_retries:
-        try:
-            with get_db() as conn:
-                cursor = conn.cursor()
-
-                # --- Fetch session ---
-                cursor.execute("""
-                    SELECT * FROM interview_sessions WHERE id = ?
-                """, (session_id,))
-                session_row = cursor.fetchone()
-
-                if not session_row:
-                    raise HTTPException(status_code=404, detail="Session not found")
-
-                session = dict(session_row)
-
-                # Parse questions JSON if needed
-                if isinstance(session.get("questions"), str) and session["questions"]:
-                    session["questions"] = json.loads(session["questions"])
-
-                if not session.get("questions"):
-                    # No questions -> mark analyzed and return success
-                    cursor.execute("""
-                        UPDATE interview_sessions 
-                        SET status = 'analyzed'
-                        WHERE id = ?
-                    """, (session_id,))
-                    return {"status": "success", "message": "Analysis complete"}
-
-                # Try to get JD/Resume text if present; fall back to empty strings
-                jd_text = (
-                    session.get("job_description")
-                    or session.get("jd")
-                    or session.get("jd_text")
-                    or ""
-                )
-                resume_text = (
-                    session.get("resume_text")
-                    or session.get("resume")
-                    or session.get("resume_content")
-                    or ""
-                )
+    try:
+        # Blocking DB reads happen on a worker thread so the event loop
+        # stays free for other requests.
+        session, answers = await run_read(_load_analysis_inputs, session_id)
 
-                # --- Fetch answers ---
-                cursor.execute("""
-                    SELECT * FROM interview_answers WHERE session_id = ?
-                """, (session_id,))
-                answer_rows = cursor.fetchall()
-                answers = [dict(row) for row in answer_rows]
-
-                # --- Cache to avoid regenerating the same reference answer per question ---
-                reference_cache = {}  # {question_id: reference_answer}
-
-                # Helper to get question text by id
-                q_text_by_id = {q["id"]: q.get("text", "") for q in session["questions"]}
-
-                # --- Evaluate answers that don't have scores yet ---
-                for answer in answers:
-                    # Skip if already scored or no transcript
-                    if answer.get("score") is not None or not answer.get("transcript"):
-                        continue
-
-                    qid = answer.get("question_id")
-                    question_text = q_text_by_id.get(qid, "")
-
-                    if not question_text:
-                        # Question not found in session questions; skip gracefully
-                        continue
-
-                    # Get or create the reference answer for this question
-                    try:
-                        if qid not in reference_cache:
-                            # NOTE: Assumes you have implemented generate_reference_answer(question, jd, resume)
-                            reference_cache[qid] = generate_reference_answer(
-                                question=question_text,
-                                jd=jd_text,
-                                resume=resume_text
-                            )
-                        reference_answer = reference_cache[qid]
-                    except Exception as ref_err:
-                        # If reference generation fails, skip evaluation for this answer
-                        print(f"Error generating reference for question {qid}: {ref_err}")
-                        continue
-
-                    # Evaluate against reference
-                    try:
-                        # NOTE: Assumes your updated evaluate_answer(question, transcript, reference_answer)
-                        evaluation = evaluate_answer(
-                            question=question_text,
-                            transcript=answer["transcript"],
-                            reference_answer=reference_answer
-                        )
-
-                        if not isinstance(evaluation, dict):
-                            raise ValueError(f"Invalid evaluation response: {evaluation}")
-
-                        # Prefer 'total_score' if provided, else fallback to 'score'
-                        score = evaluation.get("total_score")
-                        if score is None:
-                            score = evaluation.get("score")
-
-                        # Ensure feedback is a list
-                        feedback = evaluation.get("feedback", [])
-                        if not isinstance(feedback, list):
-                            feedback = [feedback] if feedback else []
-
-                        # Store the reference (ideal) answer in model_answer column
-                        model_answer = reference_answer or evaluation.get("model_answer", "")
-
-                        cursor.execute("""
-                            UPDATE interview_answers
-                            SET score = ?, feedback = ?, model_answer = ?
-                            WHERE id = ?
-                        """, (
-                            score,
-                            json.dumps(feedback, ensure_ascii=False),
-                            model_answer,
-                            answer["id"]
-                        ))
-
-                    except Exception as eval_error:
-                        # Log and continue with other answers
-                        print(f"Error evaluating answer {answer.get('id')}: {str(eval_error)}")
-                        continue
-
-                # --- Update session status (after all answers processed) ---
-                cursor.execute("""
-                    UPDATE interview_sessions
-                    SET status = 'analyzed'
-                    WHERE id = ?
-                """, (session_id,))
-            
-            # Success - break out of retry loop
+        if not session.get("questions"):
+            # No questions -> mark analyzed and return success
+            await run_write(_persist_analysis, session_id, [])
             return {"status": "success", "message": "Analysis complete"}
-            
-        except Exception as db_error:
-            retry_count += 1
-            if retry_count >= max_db_retries:
-                # If it's an HTTPException, re-raise it
-                if isinstance(db_error, HTTPException):
-                    raise db_error
-                raise HTTPException(
-                    status_code=500,
-                    detail=f"Database error during analysis after {max_db_retries} retries: {str(db_error)}"
+
+        # Try to get JD/Resume text if present; fall back to empty strings
+        jd_text = (
+            session.get("job_description")
+            or session.get("jd")
+            or session.get("jd_text")
+            or ""
+        )
+        resume_text = (
+            session.get("resume_text")
+            or session.get("resume")
+            or session.get("resume_content")
+            or ""
+        )
+
+        # --- Cache to avoid regenerating the same reference answer per question ---
+        reference_cache = {}  # {question_id: reference_answer}
+
+        # Helper to get question text by id
+        q_text_by_id = {q["id"]: q.get("text", "") for q in session["questions"]}
+
+        # --- Evaluate answers that don't have scores yet ---
+        # Collect per-answer updates and flush them in one executemany
+        # instead of a round trip per row.
+        answer_updates = []
+
+        # Both LLM calls are network-bound, so run them concurrently on
+        # the default executor instead of serializing the round trips.
+        loop = asyncio.get_running_loop()
+
+        # Only answers with a transcript, no score yet, and a known question
+        # need any work; filtering once up front keeps the gather fan-out
+        # tight and avoids re-testing the same conditions per phase.
+        pending = [
+            answer for answer in answers
+            if answer.get("score") is None
+            and answer.get("transcript")
+            and answer.get("question_id") in q_text_by_id
+        ]
+
+        # Phase 1: resolve reference answers for all distinct questions that
+        # still need evaluation. Persistent-cache hits are free; every miss
+        # goes to the LLM in one fused request instead of a call per question.
+        needed_qids = [
+            qid for qid in dict.fromkeys(answer["question_id"] for answer in pending)
+            if qid not in reference_cache
+        ]
+
+        resolved, missing_qids = await loop.run_in_executor(
+            None, _resolve_references,
+            {qid: q_text_by_id[qid] for qid in needed_qids}, jd_text, resume_text
+        )
+        reference_cache.update(resolved)
+
+        # Per-question fallback (in parallel) for anything the batched
+        # response didn't cover.
+        if missing_qids:
+            ref_results = await asyncio.gather(*[
+                loop.run_in_executor(None, _cached_reference,
+                    _reference_hash(q_text_by_id[qid], jd_text, resume_text),
+                    q_text_by_id[qid],
+                    jd_text,
+                    resume_text
                 )
-            # Wait before retrying (exponential backoff)
-            time.sleep(0.2 * retry_count)
-    
-    # Should not reach here, but just in case
-    raise HTTPException(status_code=500, detail="Analysis failed after retries")
+                for qid in missing_qids
+            ], return_exceptions=True)
+
+            for qid, ref_result in zip(missing_qids, ref_results):
+                if isinstance(ref_result, Exception):
+                    # If reference generation fails, skip evaluation for this question
+                    print(f"Error generating reference for question {qid}: {ref_result}")
+                else:
+                    reference_cache[qid] = ref_result
+
+        # Phase 2: evaluate every pending answer against its reference,
+        # also in parallel.
+        to_evaluate = [
+            answer for answer in pending
+            if answer["question_id"] in reference_cache
+        ]
+
+        eval_results = await asyncio.gather(*[
+            loop.run_in_executor(None, functools.partial(
+                evaluate_answer,
+                question=q_text_by_id[answer["question_id"]],
+                transcript=answer["transcript"],
+                reference_answer=reference_cache[answer["question_id"]]
+            ))
+            for answer in to_evaluate
+        ], return_exceptions=True)
+
+        for answer, evaluation in zip(to_evaluate, eval_results):
+            reference_answer = reference_cache[answer["question_id"]]
+
+            try:
+                if isinstance(evaluation, Exception):
+                    raise evaluation
+
+                if not isinstance(evaluation, dict):
+                    raise ValueError(f"Invalid evaluation response: {evaluation}")
+
+                # Prefer 'total_score' if provided, else fallback to 'score'
+                score = evaluation.get("total_score")
+                if score is None:
+                    score = evaluation.get("score")
+
+                # Ensure feedback is a list
+                feedback = evaluation.get("feedback", [])
+                if not isinstance(feedback, list):
+                    feedback = [feedback] if feedback else []
+
+                # Store the reference (ideal) answer in model_answer column
+                model_answer = reference_answer or evaluation.get("model_answer", "")
+
+                answer_updates.append((
+                    score,
+                    orjson.dumps(feedback),
+                    model_answer,
+                    answer["id"]
+                ))
+
+            except Exception as eval_error:
+                # Log and continue with other answers
+                print(f"Error evaluating answer {answer.get('id')}: {str(eval_error)}")
+                continue
+
+        # --- Persist all answer updates in one write transaction ---
+        await run_write(_persist_analysis, session_id, answer_updates)
+
+        return {"status": "success", "message": "Analysis complete"}
+
+    except HTTPException:
+        raise
+    except Exception as db_error:
+        raise HTTPException(
+            status_code=500,
+            detail=f"Database error during analysis: {str(db_error)}"
+        )
+
+
+
+
+def _load_report_data(session_id: str):
+    """Blocking read of everything the PDF report needs (runs on a worker thread)."""
+    with get_reader() as conn:
+        cursor = conn.cursor()
 
+        cursor.execute(_SQL_SELECT_SESSION_FOR_REPORT, (session_id,))
+        session_row = cursor.fetchone()
 
+        if not session_row:
+            raise HTTPException(status_code=404, detail="Session not found")
+
+        session = dict(session_row)
+
+        if isinstance(session.get("questions"), (str, bytes)):
+            session["questions"] = orjson.loads(session["questions"])
+
+        cursor.execute(_SQL_SELECT_ANSWERS_FOR_REPORT, (session_id,))
+        answers = [dict(row) for row in cursor.fetchall()]
+
+        for answer in answers:
+            if isinstance(answer.get("feedback"), (str, bytes)):
+                answer["feedback"] = orjson.loads(answer["feedback"])
+
+    return session, answers
 
 
 @router.get("/export-pdf/{session_id}")
 async def export_pdf(session_id: str):
     try:
-        with get_db() as conn:
-            cursor = conn.cursor()
-            
-            # Get session
-            cursor.execute("""
-                SELECT * FROM interview_sessions WHERE id = ?
-            """, (session_id,))
-            session_row = cursor.fetchone()
-            
-            if not session_row:
-                raise HTTPException(status_code=404, detail="Session not found")
-            
-            session = dict(session_row)
-
-            if isinstance(session.get("questions"), str):
-                session["questions"] = json.loads(session["questions"])
-
-            # Get answers
-            cursor.execute("""
-                SELECT * FROM interview_answers WHERE session_id = ?
-            """, (session_id,))
-            answer_rows = cursor.fetchall()
-            
-            answers = [dict(row) for row in answer_rows]
-
-            for answer in answers:
-                if isinstance(answer.get("feedback"), str):
-                    answer["feedback"] = json.loads(answer["feedback"])
-
-        pdf_bytes = generate_pdf_report(session, answers)
+        session, answers = await run_read(_load_report_data, session_id)
+
+        # ReportLab generation is CPU-bound; keep it off the event loop thread.
+        loop = asyncio.get_running_loop()
+        pdf_bytes = await loop.run_in_executor(None, generate_pdf_report, session, answers)
 
         return StreamingResponse(
-            iter([pdf_bytes]),
+            iter_pdf_chunks(pdf_bytes),
             media_type="application/pdf",
             headers={"Content-Disposition": f"attachment; filename=interview_results_{session_id[:8]}.pdf"}
         )
@@ -1,12 +1,27 @@
 from fastapi import APIRouter, UploadFile, File, Form, HTTPException
-from backend.database import get_db
+from backend.database import get_reader, get_writer, run_read
 from backend.services.pdf_service import extract_text_from_pdf
 from backend.services.llm_service import generate_questions
-import json
+import orjson
 import uuid
 
 router = APIRouter()
 
+# Module-level SQL constants so statement-cache lookups key on small interned
+# strings instead of re-hashing triple-quoted literals per call.
+_SQL_INSERT_SESSION = (
+    "INSERT INTO interview_sessions "
+    "(id, job_description, resume_text, duration_seconds, questions, status) "
+    "VALUES (?, ?, ?, ?, ?, ?)"
+)
+# resume_text can be many KB and the session view never shows it, so leave
+# it out of the projection.
+_SQL_SELECT_SESSION = (
+    "SELECT id, job_description, duration_seconds, questions, status, "
+    "created_at, updated_at FROM interview_sessions WHERE id = ?"
+)
+_SQL_SELECT_ANSWERS = "SELECT * FROM interview_answers WHERE session_id = ?"
+
 @router.post("/create-session")
 async def create_session(
     job_description: str = Form(...),
@@ -21,18 +36,14 @@ async def create_session(
 
         session_id = str(uuid.uuid4())
         
-        with get_db() as conn:
+        with get_writer() as conn:
             cursor = conn.cursor()
-            cursor.execute("""
-                INSERT INTO interview_sessions 
-                (id, job_description, resume_text, duration_seconds, questions, status)
-                VALUES (?, ?, ?, ?, ?, ?)
-            """, (
+            cursor.execute(_SQL_INSERT_SESSION, (
                 session_id,
                 job_description,
                 resume_text,
                 duration,
-                json.dumps(questions),
+                orjson.dumps(questions),
                 "created"
             ))
 
@@ -45,40 +56,42 @@ async def create_session(
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
 
+def _load_session(session_id: str):
+    """Blocking read of the session row and its answers (runs on a worker thread)."""
+    with get_reader() as conn:
+        cursor = conn.cursor()
+
+        # Get session
+        cursor.execute(_SQL_SELECT_SESSION, (session_id,))
+        session_row = cursor.fetchone()
+
+        if not session_row:
+            raise HTTPException(status_code=404, detail="Session not found")
+
+        # Convert row to dict
+        session = dict(session_row)
+
+        # Parse questions JSON (stored as raw orjson bytes; older rows are TEXT)
+        if isinstance(session.get("questions"), (str, bytes)):
+            session["questions"] = orjson.loads(session["questions"])
+
+        # Get answers
+        cursor.execute(_SQL_SELECT_ANSWERS, (session_id,))
+        answer_rows = cursor.fetchall()
+
+        answers = [dict(row) for row in answer_rows]
+
+        # Parse feedback JSON for each answer
+        for answer in answers:
+            if isinstance(answer.get("feedback"), (str, bytes)):
+                answer["feedback"] = orjson.loads(answer["feedback"])
+
+    return session, answers
+
 @router.get("/session/{session_id}")
 async def get_session(session_id: str):
     try:
-        with get_db() as conn:
-            cursor = conn.cursor()
-            
-            # Get session
-            cursor.execute("""
-                SELECT * FROM interview_sessions WHERE id = ?
-            """, (session_id,))
-            session_row = cursor.fetchone()
-            
-            if not session_row:
-                raise HTTPException(status_code=404, detail="Session not found")
-            
-            # Convert row to dict
-            session = dict(session_row)
-            
-            # Parse questions JSON
-            if isinstance(session.get("questions"), str):
-                session["questions"] = json.loads(session["questions"])
-            
-            # Get answers
-            cursor.execute("""
-                SELECT * FROM interview_answers WHERE session_id = ?
-            """, (session_id,))
-            answer_rows = cursor.fetchall()
-            
-            answers = [dict(row) for row in answer_rows]
-            
-            # Parse feedback JSON for each answer
-            for answer in answers:
-                if isinstance(answer.get("feedback"), str):
-                    answer["feedback"] = json.loads(answer["feedback"])
+        session, answers = await run_read(_load_session, session_id)
 
         return {
             "session": session,
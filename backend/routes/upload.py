@@ -1,11 +1,11 @@
 from fastapi import APIRouter, UploadFile, File, HTTPException
-from backend.database import get_db
+from backend.database import get_writer, run_write
 from backend.services.transcription_service import transcribe_audio
 from pathlib import Path
+import aiofiles
+import asyncio
 import os
 import uuid
-import shutil
-import time
 
 # Get project root directory
 project_root = Path(__file__).parent.parent.parent
@@ -13,6 +13,31 @@ uploads_dir = project_root / "uploads"
 
 router = APIRouter()
 
+# Module-level SQL constants so statement-cache lookups key on small interned
+# strings instead of re-hashing triple-quoted literals per call.
+_SQL_UPSERT_ANSWER = (
+    "INSERT INTO interview_answers "
+    "(id, session_id, question_id, audio_path, transcript) "
+    "VALUES (?, ?, ?, ?, ?) "
+    "ON CONFLICT(session_id, question_id) DO UPDATE SET "
+    "audio_path = excluded.audio_path, transcript = excluded.transcript"
+)
+_SQL_UPDATE_SESSION_STATUS = "UPDATE interview_sessions SET status = 'in_progress' WHERE id = ?"
+
+
+def _save_answer(session_id: str, question_id: str, audio_path_relative: str, transcript: str):
+    """Blocking upsert of the answer row plus the session status flip."""
+    with get_writer() as conn:
+        cursor = conn.cursor()
+
+        # Insert or update in one statement via the unique
+        # (session_id, question_id) index
+        cursor.execute(_SQL_UPSERT_ANSWER,
+                       (str(uuid.uuid4()), session_id, question_id, audio_path_relative, transcript))
+
+        # Update session status
+        cursor.execute(_SQL_UPDATE_SESSION_STATUS, (session_id,))
+
 @router.post("/upload-answer/{session_id}/{question_id}")
 async def upload_answer(
     session_id: str,
@@ -24,29 +49,34 @@ async def upload_answer(
     
     try:
         # Ensure uploads directory exists
-        os.makedirs(str(uploads_dir), exist_ok=True)
-
-        # Read audio content first
-        content = await audio.read()
-        if not content:
-            raise HTTPException(status_code=400, detail="Empty audio file received")
+        uploads_dir.mkdir(parents=True, exist_ok=True)
 
         # Write to temporary file first to avoid partial writes
         file_extension = audio.filename.split(".")[-1] if "." in audio.filename else "webm"
         filename = f"{uuid.uuid4()}.{file_extension}"
         file_path = uploads_dir / filename
-        
+
         # Use temporary file to ensure atomic write
         temp_file_path = uploads_dir / f"{filename}.tmp"
-        
+
         try:
-            with open(str(temp_file_path), "wb") as f:
-                f.write(content)
-            
-            # Atomic move (rename) - this is safer on Windows
-            if os.path.exists(str(file_path)):
-                os.remove(str(file_path))
-            shutil.move(str(temp_file_path), str(file_path))
+            # Stream the upload to disk in 64KB chunks instead of buffering
+            # the whole blob in memory; the async write keeps the event loop
+            # free for other requests
+            async with aiofiles.open(str(temp_file_path), "wb") as f:
+                while True:
+                    chunk = await audio.read(65536)
+                    if not chunk:
+                        break
+                    await f.write(chunk)
+
+            if temp_file_path.stat().st_size == 0:
+                temp_file_path.unlink()
+                raise HTTPException(status_code=400, detail="Empty audio file received")
+
+            # os.replace is atomic on both POSIX and Windows and overwrites
+            # any existing file, so no pre-delete is needed
+            os.replace(str(temp_file_path), str(file_path))
             temp_file_path = None  # Mark as successfully moved
         except (IOError, OSError) as e:
             raise HTTPException(
@@ -54,9 +84,10 @@ async def upload_answer(
                 detail=f"Failed to save audio file: {str(e)}"
             )
 
-        # Transcribe audio
+        # Transcribe audio (CPU-bound; keep it off the event loop thread)
         try:
-            transcript = transcribe_audio(str(file_path))
+            loop = asyncio.get_running_loop()
+            transcript = await loop.run_in_executor(None, transcribe_audio, str(file_path))
         except Exception as e:
             # If transcription fails, still save the audio but with empty transcript
             transcript = ""
@@ -65,57 +96,16 @@ async def upload_answer(
         # Store relative path for web access (just the filename)
         audio_path_relative = f"uploads/{filename}"
 
-        # Database operations with retry logic
-        max_retries = 3
-        retry_count = 0
-        
-        while retry_count < max_retries:
-            try:
-                with get_db() as conn:
-                    cursor = conn.cursor()
-                    
-                    # Check if answer already exists
-                    cursor.execute("""
-                        SELECT id FROM interview_answers 
-                        WHERE session_id = ? AND question_id = ?
-                    """, (session_id, question_id))
-                    existing = cursor.fetchone()
-
-                    if existing:
-                        # Update existing answer
-                        cursor.execute("""
-                            UPDATE interview_answers 
-                            SET audio_path = ?, transcript = ?
-                            WHERE id = ?
-                        """, (audio_path_relative, transcript, existing["id"]))
-                    else:
-                        # Insert new answer
-                        answer_id = str(uuid.uuid4())
-                        cursor.execute("""
-                            INSERT INTO interview_answers 
-                            (id, session_id, question_id, audio_path, transcript)
-                            VALUES (?, ?, ?, ?, ?)
-                        """, (answer_id, session_id, question_id, audio_path_relative, transcript))
-
-                    # Update session status
-                    cursor.execute("""
-                        UPDATE interview_sessions 
-                        SET status = 'in_progress'
-                        WHERE id = ?
-                    """, (session_id,))
-                
-                # Success - break out of retry loop
-                break
-                
-            except Exception as db_error:
-                retry_count += 1
-                if retry_count >= max_retries:
-                    raise HTTPException(
-                        status_code=500,
-                        detail=f"Database error after {max_retries} retries: {str(db_error)}"
-                    )
-                # Wait a bit before retrying (exponential backoff)
-                time.sleep(0.1 * retry_count)
+        # Database operations; lock contention is handled by SQLite's own
+        # busy_timeout instead of an application-level retry loop, and the
+        # blocking work runs on a worker thread behind the write lock.
+        try:
+            await run_write(_save_answer, session_id, question_id, audio_path_relative, transcript)
+        except Exception as db_error:
+            raise HTTPException(
+                status_code=500,
+                detail=f"Database error: {str(db_error)}"
+            )
 
         return {
             "transcript": transcript,
@@ -125,15 +115,10 @@ async def upload_answer(
     except HTTPException:
         raise
     except Exception as e:
-        # Clean up files on error
-        if temp_file_path and os.path.exists(str(temp_file_path)):
-            try:
-                os.remove(str(temp_file_path))
-            except:
-                pass
-        if file_path and os.path.exists(str(file_path)):
-            try:
-                os.remove(str(file_path))
-            except:
-                pass
+        # Clean up files on error; missing_ok skips the stat+unlink dance
+        # (and its TOCTOU race) in one syscall
+        if temp_file_path is not None:
+            temp_file_path.unlink(missing_ok=True)
+        if file_path is not None:
+            file_path.unlink(missing_ok=True)
         raise HTTPException(status_code=500, detail=f"Upload failed: {str(e)}")
@@ -6,6 +6,13 @@ from reportlab.lib.enums import TA_LEFT, TA_CENTER
 from io import BytesIO
 from datetime import datetime
 
+PDF_CHUNK_SIZE = 64 * 1024
+
+def iter_pdf_chunks(pdf_bytes: bytes, chunk_size: int = PDF_CHUNK_SIZE):
+    """Yield pdf_bytes in chunk_size pieces so ASGI can flush as it sends."""
+    for start in range(0, len(pdf_bytes), chunk_size):
+        yield pdf_bytes[start:start + chunk_size]
+
 def generate_pdf_report(session_data: dict, answers_data: list) -> bytes:
     buffer = BytesIO()
     doc = SimpleDocTemplate(buffer, pagesize=letter, topMargin=0.5*inch, bottomMargin=0.5*inch)
@@ -1,6 +1,6 @@
 import json
 from groq import Groq
-from backend.config import get_settings, get_settingsgpt
+from backend.config import get_settings
 from openai import OpenAI
 
 
@@ -9,16 +9,16 @@ def get_client():
     settings = get_settings()
     if not settings.groq_api_key:
         raise ValueError("GROQ_API_KEY is required. Please set it in your .env file or environment variables.")
-    
+
     return Groq(api_key=settings.groq_api_key)
 
 def get_clientgpt():
-    """Lazy initialization of Groq client to avoid loading settings at import time."""
-    settingsgpt = get_settingsgpt()
-    if not settingsgpt.openai_api_key:
-        raise ValueError("OPENAI_API_KEY is required. Please set it in your.env file or environment variables.")
+    """Lazy initialization of OpenAI client to avoid loading settings at import time."""
+    settings = get_settings()
+    if not settings.openai_api_key:
+        raise ValueError("OPENAI_API_KEY is required. Please set it in your .env file or environment variables.")
 
-    return OpenAI(api_key=settingsgpt.openai_api_key)
+    return OpenAI(api_key=settings.openai_api_key)
 
 def generate_questions(job_description: str, resume_text: str, duration_seconds: int) -> list:
     client = get_client()
@@ -119,6 +119,52 @@ Give objective scoring, not polite feedback. Penalize vague or incorrect answers
         return json.loads(content)
 
 
+def generate_reference_answers_batch(questions: dict, jd: str, resume: str) -> dict:
+    """Generate reference answers for several questions in one LLM round trip.
+
+    questions maps question id -> question text; returns {id: answer} for
+    every question the model covered. Callers should fall back to
+    generate_reference_answer for anything missing from the result.
+    """
+    client = get_client()
+    system_prompt = """You are an interview expert. For EVERY question below, write a high-quality, ideal answer considering the candidate's resume and the job description. Keep each answer concise and professional.
+Return ONLY strict JSON in this format:
+{"answers": [{"qid": "q1", "answer": "..."}]}"""
+
+    questions_block = "\n".join(f"- {qid}: {text}" for qid, text in questions.items())
+    user_prompt = f"""Job Description: {jd}
+Resume Summary: {resume}
+Questions:
+{questions_block}"""
+
+    response = client.chat.completions.create(
+        model="llama-3.3-70b-versatile",
+        messages=[
+            {"role": "system", "content": system_prompt},
+            {"role": "user", "content": user_prompt},
+        ],
+        temperature=0.5,
+        max_tokens=min(500 * len(questions), 4096),
+        response_format={"type": "json_object"},
+    )
+
+    content = response.choices[0].message.content.strip()
+    try:
+        result = json.loads(content)
+    except json.JSONDecodeError:
+        if "```json" in content:
+            content = content.split("```json")[1].split("```")[0]
+        elif "```" in content:
+            content = content.split("```")[1].split("```")[0]
+        result = json.loads(content)
+
+    return {
+        item["qid"]: item["answer"]
+        for item in result.get("answers", [])
+        if item.get("qid") in questions and item.get("answer")
+    }
+
+
 def generate_reference_answer(question: str, jd: str, resume: str):
     client = get_client()
     system_prompt = """You are an interview expert. Write a high-quality, ideal answer to the interview question below, considering the candidate's resume and the job description. Keep it concise and professional."""
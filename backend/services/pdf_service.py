@@ -1,9 +1,23 @@
+import functools
+import hashlib
 from PyPDF2 import PdfReader
 from io import BytesIO
 
-def extract_text_from_pdf(pdf_bytes: bytes) -> str:
+@functools.lru_cache(maxsize=64)
+def _extract_cached(digest: bytes, pdf_bytes: bytes) -> str:
+    """Cached extraction keyed primarily by content digest.
+
+    The digest makes cache-key comparisons cheap; pdf_bytes just carries the
+    payload for the miss path.
+    """
     reader = PdfReader(BytesIO(pdf_bytes))
     text = ""
     for page in reader.pages:
         text += page.extract_text() + "\n"
     return text.strip()
+
+def extract_text_from_pdf(pdf_bytes: bytes) -> str:
+    # The same resume is often uploaded repeatedly (re-runs, retries);
+    # extraction is CPU-heavy, so skip it on identical content.
+    digest = hashlib.blake2b(pdf_bytes, digest_size=16).digest()
+    return _extract_cached(digest, pdf_bytes)